@@ -6,8 +6,10 @@ Includes utilities for initialization, migration tracking, table viewing,
 schema updates, and bulk resets.
 """
 
+import atexit
 import sqlite3
 import logging
+import threading
 from tabulate import tabulate
 
 # Setup logging
@@ -15,12 +17,85 @@ logging.basicConfig(level=logging.INFO, format="%(asctime)s [%(levelname)s] %(me
 
 DB_FILE = "migrated_posts.db"
 
+# Rows fetched and rendered per table chunk in view_migrated_posts
+VIEW_BATCH_SIZE = 1000
+
+# Applied to every long-lived connection: WAL journaling with NORMAL sync keeps
+# fsync off the per-commit path; the rest keeps pages and temp data in memory.
+PRAGMAS = (
+    "PRAGMA journal_mode=WAL",
+    "PRAGMA synchronous=NORMAL",
+    "PRAGMA cache_size=-65536",
+    "PRAGMA temp_store=MEMORY",
+    "PRAGMA mmap_size=268435456",
+)
+
+# Shared connection to DB_FILE, opened on first use and reused for the whole run
+_CONN = None
+
+# Serializes media cache access from concurrent upload threads
+_MEDIA_CACHE_LOCK = threading.Lock()
+
+
+def get_connection():
+    """
+    Returns the shared connection to DB_FILE, opening it on first use.
+    Opening it also creates the 'media_cache' table, so uploads can use the
+    cache without initialize_db(). The connection is closed automatically
+    when the interpreter exits.
+    """
+    global _CONN
+    if _CONN is None:
+        conn = sqlite3.connect(DB_FILE, check_same_thread=False)
+        configure_connection(conn)
+        with conn:
+            conn.execute("""
+                CREATE TABLE IF NOT EXISTS media_cache (
+                    hash TEXT PRIMARY KEY,
+                    media_id INTEGER
+                )
+            """)
+        _CONN = conn
+    return _CONN
+
+
+def configure_connection(conn):
+    """
+    Applies the performance PRAGMAs to an open SQLite connection.
+    """
+    for pragma in PRAGMAS:
+        conn.execute(pragma)
+
+
+def close_connection():
+    """
+    Closes the shared connection if it is open.
+    """
+    global _CONN
+    if _CONN is not None:
+        _CONN.close()
+        _CONN = None
+
+
+atexit.register(close_connection)
+
+
+def _connect(db_path):
+    """
+    Returns a (connection, owned) pair for db_path. DB_FILE is served by the
+    shared connection; any other path gets a new connection the caller must close.
+    """
+    if db_path == DB_FILE:
+        return get_connection(), False
+    return sqlite3.connect(db_path), True
+
 
 def initialize_db():
     """
     Initializes the database and creates the 'posts' table if it doesn't exist.
+    The 'media_cache' table is created by get_connection().
     """
-    conn = sqlite3.connect(DB_FILE)
+    conn = get_connection()
     c = conn.cursor()
     c.execute("""
         CREATE TABLE IF NOT EXISTS posts (
@@ -31,30 +106,76 @@ def initialize_db():
         )
     """)
     conn.commit()
-    conn.close()
 
 
 def is_post_migrated(url):
     """
     Checks if a given post URL already exists in the migration table.
     """
-    conn = sqlite3.connect(DB_FILE)
-    c = conn.cursor()
+    c = get_connection().cursor()
     c.execute("SELECT 1 FROM posts WHERE url = ?", (url,))
     result = c.fetchone()
-    conn.close()
     return result is not None
 
 
+def load_migrated_urls():
+    """
+    Returns the set of all URLs already recorded in the migration table.
+    """
+    return {row[0] for row in get_connection().execute("SELECT url FROM posts")}
+
+
 def mark_post_as_migrated(url):
     """
     Inserts a URL into the posts table to track migration.
     """
-    conn = sqlite3.connect(DB_FILE)
+    conn = get_connection()
     c = conn.cursor()
     c.execute("INSERT OR IGNORE INTO posts (url) VALUES (?)", (url,))
     conn.commit()
-    conn.close()
+
+
+def mark_posts_as_migrated(urls):
+    """
+    Inserts a batch of URLs into the posts table in a single transaction.
+    """
+    if not urls:
+        return
+    conn = get_connection()
+    c = conn.cursor()
+    c.executemany("INSERT OR IGNORE INTO posts (url) VALUES (?)", [(url,) for url in urls])
+    conn.commit()
+
+
+def get_cached_media_id(image_hash):
+    """
+    Returns the WordPress media ID recorded for an image content hash, or None.
+    """
+    try:
+        with _MEDIA_CACHE_LOCK:
+            row = get_connection().execute(
+                "SELECT media_id FROM media_cache WHERE hash = ?", (image_hash,)
+            ).fetchone()
+        return row[0] if row else None
+    except sqlite3.Error as e:
+        logging.warning(f"⚠️ Media cache lookup failed: {e}")
+        return None
+
+
+def cache_media_id(image_hash, media_id):
+    """
+    Records the WordPress media ID for an uploaded image's content hash.
+    """
+    try:
+        with _MEDIA_CACHE_LOCK:
+            conn = get_connection()
+            with conn:
+                conn.execute(
+                    "INSERT OR IGNORE INTO media_cache (hash, media_id) VALUES (?, ?)",
+                    (image_hash, media_id)
+                )
+    except sqlite3.Error as e:
+        logging.warning(f"⚠️ Could not record media cache entry: {e}")
 
 
 def mark_featured_image_as_migrated(url):
@@ -64,15 +185,17 @@ def mark_featured_image_as_migrated(url):
     logging.warning("mark_featured_image_as_migrated is defined but not used.")
 
 
-def view_migrated_posts(db_path="migrated_posts.db", table_name="posts"):
+def view_migrated_posts(db_path=DB_FILE, table_name="posts"):
     """
-    Displays all records from the posts table in a formatted table.
+    Displays all records from the posts table in a formatted table,
+    rendered in batches of VIEW_BATCH_SIZE rows.
     """
+    conn, owned = None, False
     try:
-        conn = sqlite3.connect(db_path)
+        conn, owned = _connect(db_path)
         cursor = conn.cursor()
         cursor.execute(f"SELECT * FROM {table_name}")
-        rows = cursor.fetchall()
+        rows = cursor.fetchmany(VIEW_BATCH_SIZE)
 
         if not rows:
             logging.info(f"No records found in '{table_name}'.")
@@ -80,12 +203,18 @@ def view_migrated_posts(db_path="migrated_posts.db", table_name="posts"):
 
         column_names = [description[0] for description in cursor.description]
         print("\nMigrated Posts:\n")
-        print(tabulate(rows, headers=column_names, tablefmt="fancy_grid"))
+
+        # Render one batch at a time so memory stays bounded by the batch size
+        headers = column_names
+        while rows:
+            print(tabulate(rows, headers=headers, tablefmt="fancy_grid"))
+            headers = ()
+            rows = cursor.fetchmany(VIEW_BATCH_SIZE)
 
     except sqlite3.Error as e:
         logging.error(f"Database error: {e}")
     finally:
-        if conn:
+        if conn and owned:
             conn.close()
 
 
@@ -93,8 +222,9 @@ def add_field_to_table(db_filename, table_name, new_field_name, field_type="TEXT
     """
     Adds a new column to the specified table if it doesn't already exist.
     """
+    conn, owned = None, False
     try:
-        conn = sqlite3.connect(db_filename)
+        conn, owned = _connect(db_filename)
         cursor = conn.cursor()
         cursor.execute(f"PRAGMA table_info({table_name})")
         columns = [col[1] for col in cursor.fetchall()]
@@ -102,14 +232,14 @@ def add_field_to_table(db_filename, table_name, new_field_name, field_type="TEXT
             logging.warning(f"⚠️ Field '{new_field_name}' already exists in '{table_name}'.")
             return
 
-        cursor.execute(f"ALTER TABLE {table_name} ADD COLUMN {new_field_name} {field_type}")
-        conn.commit()
+        with conn:
+            conn.execute(f"ALTER TABLE {table_name} ADD COLUMN {new_field_name} {field_type}")
         logging.info(f"✅ Added column '{new_field_name}' ({field_type}) to table '{table_name}'.")
 
     except sqlite3.Error as e:
         logging.error(f"❌ SQLite error: {e}")
     finally:
-        if conn:
+        if conn and owned:
             conn.close()
 
 
@@ -117,30 +247,33 @@ def set_default_value_for_field(db_filename, table_name, field_name, default_val
     """
     Sets a default value for a specific field across all rows in a table.
     """
+    conn, owned = None, False
     try:
-        conn = sqlite3.connect(db_filename)
-        cursor = conn.cursor()
-        cursor.execute(f"UPDATE {table_name} SET {field_name} = ?", (default_value,))
-        conn.commit()
+        conn, owned = _connect(db_filename)
+        with conn:
+            conn.execute(f"UPDATE {table_name} SET {field_name} = ?", (default_value,))
         logging.info(f"✅ Default value '{default_value}' set for field '{field_name}' in '{table_name}'.")
 
     except sqlite3.Error as e:
         logging.error(f"❌ SQLite error: {e}")
     finally:
-        if conn:
+        if conn and owned:
             conn.close()
 
 
 def delete_migrated_posts():
     """
-    Deletes all entries from the posts table and resets the ID counter.
+    Deletes all entries from the posts table and resets the ID counter
+    in a single transaction.
     """
-    conn = sqlite3.connect(DB_FILE)
-    cursor = conn.cursor()
-    cursor.execute("DELETE FROM posts")
-    cursor.execute("DELETE FROM sqlite_sequence WHERE name='posts'")
-    conn.commit()
-    conn.close()
+    conn = get_connection()
+    with conn:
+        conn.executescript("""
+            BEGIN;
+            DELETE FROM posts;
+            DELETE FROM sqlite_sequence WHERE name='posts';
+            COMMIT;
+        """)
     logging.info("🧹 All posts deleted and sequence reset.")
 
 
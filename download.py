@@ -6,18 +6,29 @@ Supports both featured and content images. Integrates with ImageOptim on macOS.
 """
 
 import os
-import re
 import shutil
 import logging
 import subprocess
 import requests
+from concurrent.futures import ThreadPoolExecutor
+from requests.adapters import HTTPAdapter
 from PIL import Image
-from io import BytesIO
 from urllib.parse import urlparse
 
 # Setup logging
 logging.basicConfig(level=logging.INFO, format="%(asctime)s [%(levelname)s] %(message)s")
 
+FEATURED_MAX_HEIGHT = 300
+IMAGEOPTIM_PATH = "/Applications/ImageOptim.app/Contents/MacOS/ImageOptim"
+CONTENT_IMAGE_WORKERS = 8
+
+# Shared session so repeated downloads from the same image host reuse
+# pooled keep-alive connections instead of a new TCP/TLS handshake each time
+_SESSION = requests.Session()
+_ADAPTER = HTTPAdapter(pool_connections=8, pool_maxsize=16)
+_SESSION.mount("https://", _ADAPTER)
+_SESSION.mount("http://", _ADAPTER)
+
 
 def process_image_links(img_list, post_title):
     """
@@ -38,6 +49,9 @@ def process_image_links(img_list, post_title):
     featured_media = img_list[0]
     featured_media_path = adjust_featured_media(featured_media, post_title)
 
+    if featured_media_path:
+        optimize_batch([featured_media_path])
+
     return {
         'featured_media': featured_media_path,
         'content_images': None  # Reserved for future content image processing
@@ -47,6 +61,7 @@ def process_image_links(img_list, post_title):
 def adjust_featured_media(featured_media_url, post_title):
     """
     Downloads and resizes a featured image with a max height of 300px.
+    Expects the images directory to exist (see process_image_links).
 
     Args:
         featured_media_url (str): URL to the image.
@@ -57,32 +72,23 @@ def adjust_featured_media(featured_media_url, post_title):
     """
     try:
         featured_media_url = clean_and_validate_url(featured_media_url)
-        response = requests.get(featured_media_url, timeout=10)
 
-        if response.status_code != 200:
-            logging.warning(f"Failed to download featured image: {featured_media_url}")
-            return None
+        with _SESSION.get(featured_media_url, timeout=10, stream=True) as response:
+            if response.status_code != 200:
+                logging.warning(f"Failed to download featured image: {featured_media_url}")
+                return None
+            img = _open_image_stream(response, max_height=FEATURED_MAX_HEIGHT)
 
         title = f"{post_title}_featured_media".replace(" ", "_")
         image_path = f"images/{title}.jpg"
 
-        img = Image.open(BytesIO(response.content))
-
-        max_height = 300
         aspect_ratio = img.width / img.height
-        new_width = int(aspect_ratio * max_height)
+        new_width = int(aspect_ratio * FEATURED_MAX_HEIGHT)
 
-        resized_img = img.resize((new_width, max_height), Image.LANCZOS)
-        os.makedirs("images", exist_ok=True)
+        resized_img = img.resize((new_width, FEATURED_MAX_HEIGHT), Image.LANCZOS)
         resized_img.save(image_path, "JPEG", quality=85)
 
         logging.info(f"✅ Saved and resized featured image: {image_path}")
-
-        subprocess.run([
-            "/Applications/ImageOptim.app/Contents/MacOS/ImageOptim",
-            image_path
-        ])
-        logging.info("✨ Optimized image with ImageOptim")
         return image_path
 
     except Exception as e:
@@ -92,7 +98,8 @@ def adjust_featured_media(featured_media_url, post_title):
 
 def adjust_content_images(img_list):
     """
-    Processes and optionally resizes multiple content images.
+    Processes and optionally resizes multiple content images concurrently,
+    then optimizes them with a single ImageOptim run.
 
     Args:
         img_list (list): List of image URLs.
@@ -100,45 +107,123 @@ def adjust_content_images(img_list):
     Returns:
         list: Paths to downloaded and optimized image files.
     """
-    path_list = []
     os.makedirs("images", exist_ok=True)
 
+    # Each worker writes its own file, so repeated URLs are fetched once and
+    # colliding basenames get a numeric suffix instead of sharing a path
+    img_list = list(dict.fromkeys(img_list))
+    file_names = _unique_file_names(img_list)
+
+    with ThreadPoolExecutor(max_workers=CONTENT_IMAGE_WORKERS) as executor:
+        results = list(executor.map(_process_one_content_image, img_list, file_names))
+
+    path_list = [path for path in results if path]
+    optimize_batch(path_list)
+    return path_list
+
+
+def _unique_file_names(img_list):
+    """
+    Derives a distinct file name for each image URL from its path basename.
+
+    Args:
+        img_list (list): Deduplicated list of image URLs.
+
+    Returns:
+        list: File names in the same order as img_list.
+    """
+    file_names = []
+    seen = set()
     for img_url in img_list:
-        try:
-            clean_img_url = clean_and_validate_url(img_url)
-            response = requests.get(clean_img_url, timeout=10)
+        file_name = os.path.basename(urlparse(img_url).path)
+        stem, ext = os.path.splitext(file_name)
+        index = 1
+        # Compare case-insensitively; the default macOS filesystem does too
+        while file_name.lower() in seen:
+            file_name = f"{stem}_{index}{ext}"
+            index += 1
+        seen.add(file_name.lower())
+        file_names.append(file_name)
+    return file_names
+
+
+def _process_one_content_image(img_url, file_name):
+    """
+    Downloads and resizes a single content image.
+
+    Args:
+        img_url (str): Image URL.
+        file_name (str): Name to save the image under in the images directory.
+
+    Returns:
+        str: Path to the saved image file or None if failed.
+    """
+    try:
+        clean_img_url = clean_and_validate_url(img_url)
 
+        with _SESSION.get(clean_img_url, timeout=10, stream=True) as response:
             if response.status_code != 200:
                 logging.warning(f"Failed to download image: {img_url}")
-                continue
-
-            parsed = urlparse(clean_img_url)
-            file_name = os.path.basename(parsed.path)
-            file_path = os.path.join("images", file_name)
-
-            img = Image.open(BytesIO(response.content))
-            if img.width > 1900:
-                aspect_ratio = img.height / img.width
-                new_size = (1900, int(1900 * aspect_ratio))
-                img = img.resize(new_size, Image.LANCZOS)
-                logging.info(f"Resized image: {file_name} to {new_size}")
-            else:
-                logging.info(f"Downloaded image (no resize): {file_name}")
-
-            img.save(file_path, format=img.format or "JPEG", quality=85)
-            path_list.append(file_path)
-
-            subprocess.run([
-                "/Applications/ImageOptim.app/Contents/MacOS/ImageOptim",
-                file_path
-            ])
-            logging.info(f"✨ Optimized image: {file_name}")
-
-        except Exception as e:
-            logging.error(f"Error processing {img_url}: {e}")
-            continue
+                return None
+            img = _open_image_stream(response)
 
-    return path_list
+        file_path = os.path.join("images", file_name)
+
+        if img.width > 1900:
+            aspect_ratio = img.height / img.width
+            new_size = (1900, int(1900 * aspect_ratio))
+            img = img.resize(new_size, Image.LANCZOS)
+            logging.info(f"Resized image: {file_name} to {new_size}")
+        else:
+            logging.info(f"Downloaded image (no resize): {file_name}")
+
+        img.save(file_path, format=img.format or "JPEG", quality=85)
+        return file_path
+
+    except Exception as e:
+        logging.error(f"Error processing {img_url}: {e}")
+        return None
+
+
+def _open_image_stream(response, max_height=None):
+    """
+    Decodes an image directly from a streamed HTTP response.
+
+    When max_height is given, JPEGs are decoded at the smallest DCT scale
+    (1/2, 1/4 or 1/8) that still covers that height, skipping most of the
+    full-size decode. Other formats are decoded at full size.
+
+    Args:
+        response (requests.Response): Response opened with stream=True.
+        max_height (int): Optional target height the image will be resized to.
+
+    Returns:
+        PIL.Image.Image: Fully loaded image.
+    """
+    response.raw.decode_content = True
+    img = Image.open(response.raw)
+    if max_height and img.height > max_height:
+        target_width = max(1, int(img.width * max_height / img.height))
+        img.draft("RGB", (target_width, max_height))
+    img.load()
+    return img
+
+
+def optimize_batch(paths):
+    """
+    Optimizes image files in place with a single ImageOptim invocation.
+
+    Args:
+        paths (list): Paths to image files.
+    """
+    if not paths:
+        return
+
+    try:
+        subprocess.run([IMAGEOPTIM_PATH, *paths])
+        logging.info(f"✨ Optimized {len(paths)} image(s) with ImageOptim")
+    except OSError as e:
+        logging.error(f"❌ Error running ImageOptim: {e}")
 
 
 def reset_directory(directory):
@@ -196,7 +281,7 @@ def is_valid_url(url):
     Returns:
         bool: True if valid, False otherwise.
     """
-    return re.match(r'^https?://', url) is not None
+    return url.startswith(("http://", "https://"))
 
 
 if __name__ == "__main__":
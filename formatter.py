@@ -5,16 +5,27 @@ Formats scraped post content into a payload suitable for WordPress REST API.
 Handles Bootstrap styling, image processing, and date formatting.
 """
 
+import re
 import random
 import logging
 from datetime import datetime
-from bs4 import BeautifulSoup
+from html import escape as escape_html, unescape
+from lxml import html
 from download import process_image_links
 from uploader import upload_featured_image
 
 # Setup logging
 logging.basicConfig(level=logging.INFO, format="%(asctime)s [%(levelname)s] %(message)s")
 
+IMAGE_CLASSES = "img-fluid mb-3"
+
+# Browser-serialized innerHTML always double-quotes attribute values, which lets
+# <img> tags be styled without building a parse tree. Quoted values are matched
+# as a unit because Chrome before 138 leaves '>' unescaped inside them.
+_IMG_TAG_RE = re.compile(r"""<img\b(?:"[^"]*"|'[^']*'|[^'">])*>""", re.IGNORECASE)
+# One attribute of an <img> tag: name, then an optional quoted or bare value
+_ATTR_RE = re.compile(r"""\s([\w-]+)(?:\s*=\s*("[^"]*"|'[^']*'|[^\s>]+))?""")
+
 
 def format_post_content(post):
     """
@@ -27,13 +38,9 @@ def format_post_content(post):
         dict: A payload containing formatted post data.
     """
     date = format_post_date(str(post["date"]))
-    soup = BeautifulSoup(post["content_html"], "html.parser")
 
     # Add Bootstrap styling to images and gather their src
-    img_links = []
-    for img in soup.find_all("img"):
-        img["class"] = img.get("class", []) + ["img-fluid", "mb-3"]
-        img_links.append(str(img["src"]))
+    content, img_links = style_content_images(post["content_html"])
 
     # Process and upload images (download, rename, optimize)
     image_path_dict = process_image_links(img_links, post["title"])
@@ -41,9 +48,6 @@ def format_post_content(post):
     # Upload the featured image and get its WordPress media ID
     featured_media_id = upload_featured_image(image_path_dict["featured_media"])
 
-    # Convert updated HTML content to string
-    content = str(soup)
-
     # Wrap with Bootstrap container and attribution notice
     wrapped_content = f"""
     <div class="container mt-4">
@@ -71,6 +75,110 @@ def format_post_content(post):
     return payload
 
 
+def style_content_images(content_html):
+    """
+    Adds Bootstrap image classes to every <img> in an HTML fragment.
+
+    Tags are patched in place, with each tag's attributes tokenized so src and
+    class are matched by name; markup the patterns cannot handle reliably (e.g.
+    unquoted or single-quoted src or class, unbalanced quotes) falls back to a
+    full lxml parse.
+
+    Args:
+        content_html (str): Post body HTML.
+
+    Returns:
+        tuple: Updated HTML string and the list of image src URLs in document order
+        (images without a src are styled but not listed).
+    """
+    pieces = []
+    img_links = []
+    pos = 0
+    for match in _IMG_TAG_RE.finditer(content_html):
+        tag = match.group(0)
+        if tag.count('"') % 2:
+            return _style_content_images_lxml(content_html)
+
+        attrs = _img_attrs(tag)
+        if any(
+            name in attrs and not (attrs[name].group(2) or "").startswith('"')
+            for name in ("src", "class")
+        ):
+            return _style_content_images_lxml(content_html)
+
+        src = attrs.get("src")
+        if src and len(src.group(2)) > 2:
+            img_links.append(unescape(src.group(2)[1:-1]))
+
+        cls = attrs.get("class")
+        if cls:
+            merged = (cls.group(2)[1:-1] + " " + IMAGE_CLASSES).strip()
+            tag = f'{tag[:cls.start(2)]}"{merged}"{tag[cls.end(2):]}'
+        else:
+            tag = f'<img class="{IMAGE_CLASSES}"{tag[4:]}'
+
+        pieces.append(content_html[pos:match.start()])
+        pieces.append(tag)
+        pos = match.end()
+
+    # An "<img" the tag pattern did not match means markup it cannot handle
+    if len(pieces) // 2 != content_html.lower().count("<img"):
+        return _style_content_images_lxml(content_html)
+
+    pieces.append(content_html[pos:])
+    return "".join(pieces), img_links
+
+
+def _img_attrs(tag):
+    """
+    Tokenizes the attributes of an <img> tag.
+
+    Args:
+        tag (str): A complete <img ...> tag.
+
+    Returns:
+        dict: Lowercased attribute name to its first regex match; group 2 holds
+        the raw value including quotes, or None for a value-less attribute.
+    """
+    attrs = {}
+    for match in _ATTR_RE.finditer(tag, 4):
+        attrs.setdefault(match.group(1).lower(), match)
+    return attrs
+
+
+def _style_content_images_lxml(content_html):
+    """
+    Parses the HTML fragment with lxml and adds Bootstrap classes to every <img>.
+
+    Args:
+        content_html (str): Post body HTML.
+
+    Returns:
+        tuple: Updated HTML string and the list of image src URLs in document order
+        (images without a src are styled but not listed).
+    """
+    fragments = html.fragments_fromstring(content_html)
+
+    img_links = []
+    for fragment in fragments:
+        if isinstance(fragment, str):
+            continue
+        for img in fragment.iter("img"):
+            cls = img.get("class")
+            img.set("class", f"{cls} {IMAGE_CLASSES}" if cls else IMAGE_CLASSES)
+            src = img.get("src")
+            if src:
+                img_links.append(src)
+
+    # Leading text comes back as a decoded str and must be re-escaped
+    content = "".join(
+        escape_html(fragment, quote=False) if isinstance(fragment, str)
+        else html.tostring(fragment, encoding="unicode")
+        for fragment in fragments
+    )
+    return content, img_links
+
+
 def format_post_date(date_str):
     """
     Converts a date like 'March 27, 2025' to ISO 8601 format with a randomized time.
@@ -8,11 +8,13 @@ in a local SQLite database.
 """
 
 import os
+import queue
 import logging
+import threading
 from selenium.common.exceptions import WebDriverException
 
-from db_handler import initialize_db, is_post_migrated, mark_post_as_migrated
-from scraper import scrape_homepage, scrape_post_content
+from db_handler import initialize_db, load_migrated_urls, mark_posts_as_migrated
+from scraper import scrape_homepage, scrape_post_content, shutdown_driver
 from formatter import format_post_content
 from uploader import upload_post
 from temp_storage import TempStorage
@@ -22,6 +24,38 @@ import update_chromedriver
 # Setup logging
 logging.basicConfig(level=logging.INFO, format="%(asctime)s [%(levelname)s] %(message)s")
 
+# Scraped posts waiting to be formatted and uploaded; bounded so scraping
+# never runs far ahead of the upload worker
+UPLOAD_QUEUE_SIZE = 4
+
+# Queue sentinel telling the upload worker to stop
+_DONE = object()
+
+
+def upload_worker(jobs, migrated_urls):
+    """
+    Formats and uploads scraped posts from the queue until the sentinel arrives.
+    Successfully uploaded URLs are appended to migrated_urls.
+    """
+    while True:
+        job = jobs.get()
+        if job is _DONE:
+            return
+
+        post, full_post = job
+        try:
+            # Format post into structure suitable for WordPress
+            formatted = format_post_content(full_post)
+
+            # Attempt to upload and record as migrated if successful
+            if upload_post(formatted):
+                migrated_urls.append(post["url"])
+                logging.info(f"Uploaded: {post['title']}")
+            else:
+                logging.error(f"Failed to upload: {post['title']}")
+        except Exception as e:
+            logging.error(f"Error formatting or uploading {post['title']}: {e}")
+
 
 def run_migration():
     """Coordinates the migration process step-by-step."""
@@ -33,37 +67,51 @@ def run_migration():
     # Ensure the main database for tracking migrations is initialized
     initialize_db()
 
-    # Scrape the homepage for available blog posts
-    posts = scrape_homepage()
-    if not posts:
-        logging.warning("No posts found on homepage.")
-        return
-
-    # Temporary storage during current run
-    temp_db = TempStorage()
-
-    for post in posts:
-        if is_post_migrated(post["url"]):
-            logging.info(f"Skipping (already migrated): {post['title']}")
-            continue
-
-        logging.info(f"Scraping: {post['title']}")
-        full_post = scrape_post_content(post["url"])
-        if not full_post:
-            logging.error(f"Failed to scrape: {post['url']}")
-            continue
-
-        temp_db.save_post(full_post)
-
-        # Format post into structure suitable for WordPress
-        formatted = format_post_content(full_post)
-
-        # Attempt to upload and mark as migrated if successful
-        if upload_post(formatted):
-            mark_post_as_migrated(post["url"])
-            logging.info(f"Uploaded: {post['title']}")
-        else:
-            logging.error(f"Failed to upload: {post['title']}")
+    # URLs uploaded during this run, written to the database in one batch
+    migrated_urls = []
+
+    # Formatting and uploading run on a worker thread so the next post can be
+    # scraped while the current one's images are processed
+    jobs = queue.Queue(maxsize=UPLOAD_QUEUE_SIZE)
+    worker = threading.Thread(target=upload_worker, args=(jobs, migrated_urls), daemon=True)
+    worker.start()
+
+    try:
+        # Scrape the homepage for available blog posts
+        posts = scrape_homepage()
+        if not posts:
+            logging.warning("No posts found on homepage.")
+            return
+
+        # Temporary storage during current run
+        temp_db = TempStorage()
+
+        # Load already-migrated URLs once instead of querying per post
+        seen = load_migrated_urls()
+
+        for post in posts:
+            if post["url"] in seen:
+                logging.info(f"Skipping (already migrated): {post['title']}")
+                continue
+
+            logging.info(f"Scraping: {post['title']}")
+            full_post = scrape_post_content(post["url"])
+            if not full_post:
+                logging.error(f"Failed to scrape: {post['url']}")
+                continue
+
+            temp_db.save_post(full_post)
+
+            # Hand off for formatting and upload; skip repeat listings of this URL
+            seen.add(post["url"])
+            jobs.put((post, full_post))
+    finally:
+        # Let the worker finish queued posts, then record successful uploads
+        # even if the run was interrupted
+        jobs.put(_DONE)
+        worker.join()
+        mark_posts_as_migrated(migrated_urls)
+        shutdown_driver()
 
     # Clean up temporary storage
     temp_db.close()
@@ -6,12 +6,14 @@ from the source blog using Selenium. It extracts titles, URLs, content HTML, and
 """
 
 import logging
-import time
 import os
 from selenium import webdriver
+from selenium.common.exceptions import TimeoutException
 from selenium.webdriver.chrome.service import Service
 from selenium.webdriver.chrome.options import Options
 from selenium.webdriver.common.by import By
+from selenium.webdriver.support import expected_conditions as EC
+from selenium.webdriver.support.ui import WebDriverWait
 
 # Setup logging
 logging.basicConfig(level=logging.INFO, format="%(asctime)s [%(levelname)s] %(message)s")
@@ -19,30 +21,93 @@ logging.basicConfig(level=logging.INFO, format="%(asctime)s [%(levelname)s] %(me
 CHROMEDRIVER_PATH = "./chromedriver-mac-x64/chromedriver"
 SOURCE_BLOG_URL = "https://whatisalexthinking.com/"
 
+# Maximum seconds to wait for JS-rendered content before giving up
+PAGE_LOAD_TIMEOUT = 10
+SHOW_MORE_TIMEOUT = 5
+
+POST_GRID_XPATH = '//*[@id="bs-2"]/span/div[1]/div'
+GRID_CELLS_XPATH = POST_GRID_XPATH + '//*[@data-ux="GridCell"]'
+SHOW_MORE_BUTTON_XPATH = '//span[contains(@data-aid, "RSS_SHOW_MORE_BUTTON")]'
+
+# Shared browser session, launched on first use and reused for every page
+_DRIVER = None
+
+
+def _get_driver():
+    """
+    Returns the shared headless Chrome driver, launching it on first use.
+    """
+    global _DRIVER
+    if _DRIVER is None:
+        options = Options()
+        options.add_argument("--headless")
+        options.add_argument("--no-sandbox")
+        options.add_argument("--disable-dev-shm-usage")
+        # Desktop-sized viewport so the homepage grid and 'Show More' button render
+        options.add_argument("--window-size=1920,1080")
+
+        service = Service(CHROMEDRIVER_PATH)
+        _DRIVER = webdriver.Chrome(service=service, options=options)
+    return _DRIVER
+
+
+def _release_page(driver):
+    """
+    Navigates away from the current page to free its memory between scrapes.
+    """
+    try:
+        driver.get("about:blank")
+    except Exception as e:
+        logging.warning(f"Could not reset browser page: {e}")
+
+
+def shutdown_driver():
+    """
+    Quits the shared Chrome driver if it is running.
+    """
+    global _DRIVER
+    if _DRIVER is not None:
+        try:
+            _DRIVER.quit()
+        except Exception as e:
+            logging.warning(f"Error shutting down Chrome driver: {e}")
+        _DRIVER = None
+
 
 def scrape_homepage():
     """
     Scrapes the homepage of the source blog and returns a list of posts
     with title, URL, and featured image.
     """
-    options = Options()
-    options.add_argument("--no-sandbox")
-    options.add_argument("--disable-dev-shm-usage")
-
-    service = Service(CHROMEDRIVER_PATH)
-    driver = webdriver.Chrome(service=service, options=options)
-
+    driver = _get_driver()
     driver.get(SOURCE_BLOG_URL)
-    time.sleep(5)  # Wait for JS to render post grid
 
     posts = []
 
     try:
-        click_show_more_button(driver)
-        time.sleep(2)
+        # Wait for JS to render the first page of posts and the 'Show More' button
+        wait = WebDriverWait(driver, PAGE_LOAD_TIMEOUT)
+        wait.until(EC.presence_of_element_located((By.XPATH, GRID_CELLS_XPATH)))
+        try:
+            wait.until(EC.element_to_be_clickable((By.XPATH, SHOW_MORE_BUTTON_XPATH)))
+            has_show_more = True
+        except TimeoutException:
+            logging.warning("No 'Show More' button found; keeping the first page of posts.")
+            has_show_more = False
+        loaded = len(driver.find_elements(By.XPATH, GRID_CELLS_XPATH))
+
+        if has_show_more:
+            click_show_more_button(driver)
+
+            # Wait for the extra posts to be appended; keep what is there if none arrive
+            try:
+                WebDriverWait(driver, SHOW_MORE_TIMEOUT).until(
+                    lambda d: len(d.find_elements(By.XPATH, GRID_CELLS_XPATH)) > loaded
+                )
+            except TimeoutException:
+                logging.warning("No additional posts loaded after clicking 'Show More'.")
 
-        container = driver.find_element(By.XPATH, '//*[@id="bs-2"]/span/div[1]/div')
-        post_elements = container.find_elements(By.XPATH, './/*[@data-ux="GridCell"]')
+        post_elements = driver.find_elements(By.XPATH, GRID_CELLS_XPATH)
 
         for post in post_elements:
             try:
@@ -71,7 +136,7 @@ def scrape_homepage():
     except Exception as e:
         logging.error(f"Could not locate main post container: {e}")
 
-    driver.quit()
+    _release_page(driver)
     return posts
 
 
@@ -80,18 +145,13 @@ def scrape_post_content(post_url):
     Scrapes the full content of a blog post, including title, date,
     main content HTML, and any embedded images.
     """
-    options = Options()
-    options.add_argument("--headless")
-    options.add_argument("--no-sandbox")
-    options.add_argument("--disable-dev-shm-usage")
-
-    service = Service(CHROMEDRIVER_PATH)
-    driver = webdriver.Chrome(service=service, options=options)
+    driver = _get_driver()
     driver.get(post_url)
-    time.sleep(5)
 
     try:
-        title_tag = driver.find_element(By.XPATH, '//h3[contains(@data-ux, "BlogMainHeading")]')
+        title_tag = WebDriverWait(driver, PAGE_LOAD_TIMEOUT).until(
+            EC.presence_of_element_located((By.XPATH, '//h3[contains(@data-ux, "BlogMainHeading")]'))
+        )
         title = title_tag.text.strip()
 
         date_tag = driver.find_element(By.XPATH, '//span[contains(@data-aid, "RSS_POST_DATE")]')
@@ -104,7 +164,7 @@ def scrape_post_content(post_url):
         image_elements = driver.find_elements(By.XPATH, '//*[@id="bs-2"]/span/section/div/div/div[1]/main/div[2]/p[1]/figure/div/img')
         images = [img.get_attribute("src") for img in image_elements if img.get_attribute("src")]
 
-        driver.quit()
+        _release_page(driver)
 
         return {
             "url": post_url,
@@ -116,7 +176,7 @@ def scrape_post_content(post_url):
 
     except Exception as e:
         logging.error(f"Error scraping post: {post_url} — {e}")
-        driver.quit()
+        _release_page(driver)
         return None
 
 
@@ -124,11 +184,14 @@ def click_show_more_button(driver):
     """
     Clicks the 'Show More' button on the homepage to load additional posts.
     """
-    show_more_button = driver.find_element(By.XPATH, '//span[contains(@data-aid, "RSS_SHOW_MORE_BUTTON")]')
+    show_more_button = driver.find_element(By.XPATH, SHOW_MORE_BUTTON_XPATH)
     show_more_button.click()
     return driver
 
 
 if __name__ == "__main__":
-    scrape_homepage()
-    scrape_post_content("https://whatisalexthinking.com/f/movie-blog-novocaine")
+    try:
+        scrape_homepage()
+        scrape_post_content("https://whatisalexthinking.com/f/movie-blog-novocaine")
+    finally:
+        shutdown_driver()
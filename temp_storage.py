@@ -7,6 +7,7 @@ using a lightweight SQLite database (temp.db).
 
 import sqlite3
 import logging
+from db_handler import configure_connection
 
 # Setup logging
 logging.basicConfig(level=logging.INFO, format="%(asctime)s [%(levelname)s] %(message)s")
@@ -18,12 +19,15 @@ class TempStorage:
     during a session run.
     """
 
+    BATCH_SIZE = 64
+
     def __init__(self, db_name="temp.db"):
         """
         Initializes a new temporary database connection.
         Creates the posts table if it doesn't already exist.
         """
         self.conn = sqlite3.connect(db_name)
+        configure_connection(self.conn)
         self.c = self.conn.cursor()
         self.c.execute("""
             CREATE TABLE IF NOT EXISTS posts (
@@ -33,25 +37,37 @@ class TempStorage:
             )
         """)
         self.conn.commit()
+        self._buffer = []
         logging.info("Initialized temporary storage (temp.db)")
 
     def save_post(self, post):
         """
-        Saves a post to the temp database.
+        Queues a post for the temp database. Posts are written in batches
+        of BATCH_SIZE; duplicate URLs are ignored.
         """
-        try:
-            self.c.execute(
-                "INSERT INTO posts (title, url, content_html) VALUES (?, ?, ?)",
-                (post["title"], post["url"], post["content_html"])
-            )
-            self.conn.commit()
-            logging.info(f"📦 Saved post to temp storage: {post['title']}")
-        except sqlite3.IntegrityError:
-            logging.warning(f"⚠️ Post already exists in temp storage: {post['url']}")
+        self._buffer.append((post["title"], post["url"], post["content_html"]))
+        logging.info(f"📦 Queued post for temp storage: {post['title']}")
+        if len(self._buffer) >= self.BATCH_SIZE:
+            self.flush()
+
+    def flush(self):
+        """
+        Writes all queued posts to the temp database in a single transaction.
+        """
+        if not self._buffer:
+            return
+        self.c.executemany(
+            "INSERT OR IGNORE INTO posts (title, url, content_html) VALUES (?, ?, ?)",
+            self._buffer
+        )
+        self.conn.commit()
+        logging.info(f"📦 Saved {len(self._buffer)} post(s) to temp storage")
+        self._buffer.clear()
 
     def close(self):
         """
-        Closes the database connection.
+        Flushes any queued posts and closes the database connection.
         """
+        self.flush()
         self.conn.close()
         logging.info("Closed temporary storage connection")
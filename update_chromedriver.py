@@ -5,10 +5,10 @@ Fetches and installs the latest stable version of ChromeDriver
 appropriate for the system architecture and OS.
 """
 
+import io
 import os
 import stat
 import zipfile
-import shutil
 import logging
 import requests
 import platform
@@ -18,18 +18,27 @@ logging.basicConfig(level=logging.INFO, format="%(asctime)s [%(levelname)s] %(me
 
 CHROMEDRIVER_URL = "https://googlechromelabs.github.io/chrome-for-testing/last-known-good-versions-with-downloads.json"
 
+# Shared session for the manifest and driver downloads
+_SESSION = requests.Session()
 
-def get_latest_stable_version():
+
+def _fetch_versions_json():
     """
-    Returns the latest stable Chrome version string.
+    Downloads and parses the Chrome for Testing versions manifest.
     """
-    res = requests.get(CHROMEDRIVER_URL)
+    res = _SESSION.get(CHROMEDRIVER_URL)
     res.raise_for_status()
-    data = res.json()
-    return data["channels"]["Stable"]["version"]
+    return res.json()
 
 
-def get_download_url(version):
+def get_latest_stable_version(versions):
+    """
+    Returns the latest stable Chrome version string from the versions manifest.
+    """
+    return versions["channels"]["Stable"]["version"]
+
+
+def get_download_url(versions):
     """
     Determines the proper ChromeDriver download URL based on OS and architecture.
     """
@@ -41,34 +50,29 @@ def get_download_url(version):
     elif os_type == "Windows":
         arch = "win32"
 
-    res = requests.get(CHROMEDRIVER_URL)
-    res.raise_for_status()
-    downloads = res.json()["channels"]["Stable"]["downloads"]["chromedriver"]
-
-    for entry in downloads:
-        if arch in entry["url"]:
-            return entry["url"]
+    downloads = versions["channels"]["Stable"]["downloads"]["chromedriver"]
+    url_by_platform = {entry["platform"]: entry["url"] for entry in downloads}
 
-    raise Exception("ChromeDriver download URL for your OS/arch not found.")
+    if arch not in url_by_platform:
+        raise Exception("ChromeDriver download URL for your OS/arch not found.")
+    return url_by_platform[arch]
 
 
 def update_chromedriver():
     """
     Downloads and unzips the latest ChromeDriver into the working directory.
     """
-    version = get_latest_stable_version()
-    url = get_download_url(version)
-    zip_name = "chromedriver.zip"
+    versions = _fetch_versions_json()
+    version = get_latest_stable_version(versions)
+    url = get_download_url(versions)
 
     logging.info(f"⬇️ Downloading ChromeDriver v{version} from {url}")
-    with requests.get(url, stream=True) as r:
-        with open(zip_name, 'wb') as f:
-            shutil.copyfileobj(r.raw, f)
+    r = _SESSION.get(url)
+    r.raise_for_status()
 
-    with zipfile.ZipFile(zip_name, 'r') as zip_ref:
+    with zipfile.ZipFile(io.BytesIO(r.content), 'r') as zip_ref:
         zip_ref.extractall()
 
-    os.remove(zip_name)
     logging.info("✅ ChromeDriver downloaded and extracted.")
 
 
@@ -7,13 +7,20 @@ Includes functionality for safe filename generation, image uploading, and post c
 
 import os
 import re
+import functools
 import requests
 import base64
+import hashlib
+import orjson
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 import unicodedata
 import logging
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from datetime import datetime
 from urllib.parse import urlparse
 from config import WP_USER, WP_APP_PASS, WP_SITE
+from db_handler import get_cached_media_id, cache_media_id
 
 # Setup logging
 logging.basicConfig(level=logging.INFO, format="%(asctime)s [%(levelname)s] %(message)s")
@@ -22,6 +29,56 @@ DB_PATH = "migrated_posts.db"
 IMAGES_DIR = "images"
 WP_MEDIA_URL = f"{WP_SITE}/wp-json/wp/v2/media"
 WP_POST_URL = f"{WP_SITE}/wp-json/wp/v2/posts"
+UPLOAD_WORKERS = 8
+
+# Ask WordPress to return only the ID instead of the full post/media object
+_ID_ONLY_PARAMS = {"_fields": "id"}
+
+# Smallest image map rewritten with a compiled regex instead of str.replace
+REGEX_MIN_URLS = 4
+
+# Deletes every ASCII character except letters, digits, and "._- "
+_SAFE_FILENAME_TABLE = str.maketrans("", "", "".join(
+    chr(c) for c in range(128) if not (chr(c).isalnum() or chr(c) in "._- ")
+))
+
+# Credentials don't change during a run, so the auth header is built once
+_AUTH_HEADER = "Basic " + base64.b64encode(f"{WP_USER}:{WP_APP_PASS}".encode()).decode("ascii")
+_JSON_HEADERS = {
+    "Authorization": _AUTH_HEADER,
+    "Content-Type": "application/json",
+    "Accept": "application/json"
+}
+_MEDIA_HEADERS = {
+    "Authorization": _AUTH_HEADER,
+    "Content-Type": "application/octet-stream",
+    "Accept": "application/json",
+    "User-Agent": "Mozilla/5.0"
+}
+
+# Shared session so every post and media upload reuses pooled keep-alive
+# connections to WP_SITE instead of a new TCP/TLS handshake per request.
+# All uploads target one host; the pool holds one connection per upload worker
+# and blocks when they are all busy rather than opening throwaway extras.
+_SESSION = requests.Session()
+_ADAPTER = HTTPAdapter(
+    pool_connections=1,
+    pool_maxsize=UPLOAD_WORKERS,
+    pool_block=True,
+    # Retry transient WordPress errors on uploads (POST is not retried by default);
+    # the final response is returned rather than raised so callers can inspect it
+    max_retries=Retry(
+        total=4,
+        backoff_factor=0.5,
+        status_forcelist=[429, 500, 502, 503, 504],
+        allowed_methods=frozenset(["POST"]),
+        respect_retry_after_header=True,
+        raise_on_status=False
+    )
+)
+_SESSION.mount("https://", _ADAPTER)
+_SESSION.mount("http://", _ADAPTER)
+_SESSION.headers.update({"User-Agent": "WP-PostUploader/1.0"})
 
 
 def upload_post(post_data):
@@ -34,13 +91,6 @@ def upload_post(post_data):
     Returns:
         bool: True if upload was successful, False otherwise.
     """
-    headers = {
-        "Authorization": "Basic " + base64.b64encode(f"{WP_USER}:{WP_APP_PASS}".encode()).decode("utf-8"),
-        "Content-Type": "application/json",
-        "Accept": "application/json",
-        "User-Agent": "WP-PostUploader/1.0"
-    }
-
     post_payload = {
         "date": post_data["date"],
         "title": post_data["title"],
@@ -51,26 +101,44 @@ def upload_post(post_data):
         "featured_media": post_data["featured_media"]
     }
 
-    response = requests.post(WP_POST_URL, headers=headers, json=post_payload)
+    response = _SESSION.post(
+        WP_POST_URL, params=_ID_ONLY_PARAMS, headers=_JSON_HEADERS, data=orjson.dumps(post_payload)
+    )
 
     if response.status_code == 201:
-        logging.info(f"✅ Successfully uploaded post: {post_data['title']}")
+        logging.info("✅ Successfully uploaded post: %s", post_data["title"])
         return True
     else:
-        logging.error(f"❌ Failed to upload post: {post_data['title']} | {response.status_code} — {response.text}")
+        logging.error(
+            "❌ Failed to upload post: %s | %s — %s", post_data["title"], response.status_code, response.text
+        )
         return False
 
 
-def get_image_headers():
+def upload_posts_bulk(posts, max_workers=UPLOAD_WORKERS):
     """
-    Returns HTTP headers for uploading media to WordPress.
+    Uploads several blog posts to WordPress concurrently.
+
+    Args:
+        posts (list): Post dictionaries accepted by upload_post.
+        max_workers (int): Maximum number of simultaneous uploads.
+
+    Returns:
+        list: Upload results (bool) in the same order as posts.
     """
-    return {
-        "Authorization": "Basic " + base64.b64encode(f"{WP_USER}:{WP_APP_PASS}".encode()).decode("utf-8"),
-        "Content-Type": "application/octet-stream",
-        "Accept": "application/json",
-        "User-Agent": "Mozilla/5.0"
-    }
+    results = [False] * len(posts)
+
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        futures = {executor.submit(upload_post, post): index for index, post in enumerate(posts)}
+        for done, future in enumerate(as_completed(futures), start=1):
+            index = futures[future]
+            try:
+                results[index] = future.result()
+            except requests.RequestException as e:
+                logging.error("❌ Error uploading post: %s — %s", posts[index]["title"], e)
+            logging.info("📤 Post uploads completed: %d/%d", done, len(posts))
+
+    return results
 
 
 def get_current_wp_date_path():
@@ -78,7 +146,15 @@ def get_current_wp_date_path():
     Returns current year and month as strings for WordPress media folder path.
     """
     now = datetime.now()
-    return now.strftime("%Y"), now.strftime("%m")
+    return _wp_date_path(now.year, now.month)
+
+
+@functools.lru_cache(maxsize=1)
+def _wp_date_path(year, month):
+    """
+    Formats a year and month as WordPress upload folder names.
+    """
+    return f"{year:04d}", f"{month:02d}"
 
 
 def upload_featured_image(image_path):
@@ -92,29 +168,64 @@ def upload_featured_image(image_path):
         int | None: Media ID of the uploaded image or None on failure.
     """
     try:
-        with open(image_path, 'rb') as img_file:
-            image_data = img_file.read()
-    except FileNotFoundError:
+        img_file = open(image_path, 'rb')
+    except (OSError, TypeError):
         logging.warning("⚠️ No file found at image_path — skipping featured image upload.")
         return None
 
-    filename = os.path.basename(image_path)
-    filename = safe_filename(filename)
-    headers = get_image_headers()
-    headers.update({"Content-Disposition": f"attachment; filename={filename}"})
+    with img_file:
+        # Skip the upload entirely if identical bytes were uploaded before
+        image_hash = _file_sha256(img_file)
+        cached_id = get_cached_media_id(image_hash)
+        if cached_id is not None:
+            logging.info("♻️ Reusing previously uploaded image: %s | Media ID: %s", image_path, cached_id)
+            return cached_id
 
-    response = requests.post(WP_MEDIA_URL, headers=headers, data=image_data)
+        filename = os.path.basename(image_path)
+        filename = safe_filename(filename)
+        headers = {**_MEDIA_HEADERS, "Content-Disposition": f"attachment; filename={filename}"}
+
+        # Stream from the same handle used for hashing; requests sets
+        # Content-Length from the file size
+        img_file.seek(0)
+        response = _SESSION.post(WP_MEDIA_URL, params=_ID_ONLY_PARAMS, headers=headers, data=img_file)
 
     if response.status_code == 201:
-        media_id = response.json().get("id")
-        logging.info(f"✅ Uploaded featured image: {filename} | Media ID: {media_id}")
+        media_id = orjson.loads(response.content).get("id")
+        if media_id is not None:
+            cache_media_id(image_hash, media_id)
+        logging.info("✅ Uploaded featured image: %s | Media ID: %s", filename, media_id)
         return media_id
     else:
-        logging.error(f"❌ Failed to upload featured image: {filename}
-{response.text}")
+        logging.error("❌ Failed to upload featured image: %s\n%s", filename, response.text)
         return None
 
 
+def _file_sha256(file_obj, chunk_size=1 << 16):
+    """
+    Returns the SHA-256 hex digest of an open binary file, read in chunks.
+    """
+    digest = hashlib.sha256()
+    for chunk in iter(lambda: file_obj.read(chunk_size), b""):
+        digest.update(chunk)
+    return digest.hexdigest()
+
+
+def upload_featured_images_bulk(image_paths, max_workers=UPLOAD_WORKERS):
+    """
+    Uploads several images to the WordPress media library concurrently.
+
+    Args:
+        image_paths (list): Local paths to the image files.
+        max_workers (int): Maximum number of simultaneous uploads.
+
+    Returns:
+        list: Media IDs in the same order as image_paths (None for failures).
+    """
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        return list(executor.map(upload_featured_image, image_paths))
+
+
 def update_image_links_in_content(content, image_map):
     """
     Replaces original image URLs in post content with WordPress upload URLs.
@@ -126,16 +237,49 @@ def update_image_links_in_content(content, image_map):
     Returns:
         str: Updated HTML content.
     """
+    urls = frozenset(url for url in image_map if url)
+    if not urls:
+        return content
+
     year, month = get_current_wp_date_path()
-    for original_url, local_filename in image_map.items():
-        new_url = f"{WP_SITE}/wp-content/uploads/{year}/{month}/{local_filename}"
-        content = content.replace(original_url, new_url)
-    return content
+    prefix = f"{WP_SITE}/wp-content/uploads/{year}/{month}/"
+
+    # For a handful of URLs, plain substring replacement beats compiling a regex;
+    # the membership check skips the full-string rewrite for absent URLs
+    if len(urls) < REGEX_MIN_URLS:
+        for original_url in sorted(urls, key=len, reverse=True):
+            if original_url not in content:
+                continue
+            content = content.replace(original_url, prefix + image_map[original_url])
+        return content
+
+    pattern = _image_url_pattern(urls)
+    return pattern.sub(lambda match: prefix + image_map[match.group(0)], content)
+
+
+@functools.lru_cache(maxsize=32)
+def _image_url_pattern(urls):
+    """
+    Compiles a single regex matching any of the given URLs.
+
+    Longer URLs are tried first so a URL that is a prefix of another
+    never shadows the longer match.
+
+    Args:
+        urls (frozenset): Non-empty original image URLs.
+
+    Returns:
+        re.Pattern: Compiled alternation pattern.
+    """
+    ordered = sorted(urls, key=len, reverse=True)
+    return re.compile("|".join(re.escape(url) for url in ordered))
 
 
+@functools.lru_cache(maxsize=4096)
 def safe_filename(name):
     """
     Sanitizes and normalizes a string for safe file naming.
+    Keeps ASCII letters, digits, spaces, '.', '_' and '-'.
 
     Args:
         name (str): Original filename.
@@ -143,8 +287,10 @@ def safe_filename(name):
     Returns:
         str: ASCII-safe filename.
     """
+    if name.isascii():
+        return name.translate(_SAFE_FILENAME_TABLE)
     name = unicodedata.normalize("NFKD", name)
-    return name.encode("ascii", "ignore").decode("ascii")
+    return name.encode("ascii", "ignore").decode("ascii").translate(_SAFE_FILENAME_TABLE)
 
 
 if __name__ == "__main__":
@@ -157,4 +303,4 @@ if __name__ == "__main__":
     }
 
     success = upload_post(test_post)
-    logging.info(f"Did it work? {success}")
+    logging.info("Did it work? %s", success)